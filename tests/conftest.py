@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# The launcher keeps its data under the home directory from import on
+os.environ["HOME"] = tempfile.mkdtemp(prefix="gallery_dl_launcher_tests_")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
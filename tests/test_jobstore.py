@@ -0,0 +1,83 @@
+import pytest
+
+import gallery_dl_launcher_new as launcher
+
+QUEUE_SIZE = 120
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = launcher.JobStore(tmp_path / "jobs.db")
+    for n in range(QUEUE_SIZE):
+        priority = (launcher.PRIORITY_NORMAL, 10, -5)[n % 3]
+        deadline = 2e9 + n % 7 if n % 5 == 0 else None
+        template = "videos-only" if n % 4 == 0 else None
+        store.add([(0, f"https://site{n % 9}.example.org/gallery/{n:03}")], priority, deadline, template=template)
+    store.add([(1, "https://other.example.org/1")])
+    for job_id in range(1, QUEUE_SIZE, 6):
+        store.mark_failed(job_id, f"error {job_id % 4}")
+    return store
+
+
+VIEWS = [
+    ("dispatch", False, None, None),
+    ("dispatch", True, None, None),
+    ("url", False, None, None),
+    ("url", True, None, None),
+    ("attempts", True, None, None),
+    ("last_error", False, None, None),
+    ("template", True, None, None),
+    ("deadline", False, None, None),
+    ("priority", False, launcher.JOB_QUEUED, None),
+    ("dispatch", False, None, "site3"),
+    ("state", True, None, "gallery/1"),
+]
+
+
+@pytest.mark.parametrize("order, descending, state, text", VIEWS)
+def test_page_matches_offset_paging(store, order, descending, state, text):
+    expected = store.query(0, state, text, order, descending, limit=QUEUE_SIZE + 10)
+    assert expected
+    for offset in range(0, len(expected) + 3, 7):
+        key, moved = store.seek(0, state, text, order, descending, None, offset)
+        assert moved == min(offset, len(expected) - 1)
+        if offset >= len(expected):
+            continue
+        page = store.page(0, state, text, order, descending, key, 10)
+        assert [row for _, row in page] == expected[offset:offset + 10]
+        assert page[0][0] == key
+
+
+@pytest.mark.parametrize("order, descending, state, text", VIEWS)
+def test_seek_moves_both_ways(store, order, descending, state, text):
+    rows = store.page(0, state, text, order, descending, None, QUEUE_SIZE + 10)
+    keys = [key for key, _ in rows]
+    middle = len(keys) // 2
+    assert store.seek(0, state, text, order, descending, keys[middle], 3) == (keys[middle + 3], 3)
+    assert store.seek(0, state, text, order, descending, keys[middle], -4) == (keys[middle - 4], -4)
+    assert store.seek(0, state, text, order, descending, keys[middle], 0) == (keys[middle], 0)
+    # Moves stop at either end of the list
+    assert store.seek(0, state, text, order, descending, keys[2], -10) == (keys[0], -2)
+    assert store.seek(0, state, text, order, descending, keys[-3], 10) == (keys[-1], 2)
+
+
+def test_page_of_empty_view(store):
+    assert store.page(0, None, "nothing matches this", "dispatch", False, None, 10) == []
+    assert store.seek(0, None, "nothing matches this", "url", False, None, 5) == (None, 0)
+
+
+def test_sort_index_created_on_first_use(store):
+    def indexes():
+        return {name for name, in store._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+    assert "jobs_sort_url" not in indexes()
+    store.page(0, None, None, "url", False, None, 10)
+    assert "jobs_sort_url" in indexes()
+    plan = " ".join(row[-1] for row in store._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM jobs WHERE instance = 0 ORDER BY url, position"))
+    assert "jobs_sort_url" in plan and "TEMP B-TREE" not in plan
+
+
+def test_unknown_sort_rejected(store):
+    with pytest.raises(ValueError):
+        store.page(0, None, None, "size", False, None, 10)
@@ -0,0 +1,101 @@
+import threading
+
+import gallery_dl_launcher_new as launcher
+
+
+def make_files(root, names):
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(name)
+
+
+def files_under(root):
+    return sorted(str(path.relative_to(root)) for path in root.rglob("*") if path.is_file())
+
+
+def events_of(resharder):
+    events = []
+    while not resharder.events.empty():
+        events.append(resharder.events.get())
+    return events
+
+
+def test_plan_moves_and_conflicts(tmp_path):
+    in_place = launcher.layout_path(tmp_path, "kept.jpg", "hash").relative_to(tmp_path)
+    make_files(tmp_path, ["a.jpg", "sub/b.png", "x/same.jpg", "y/same.jpg", "c.jpg.part", str(in_place)])
+    resharder = launcher.Resharder(tmp_path, "hash")
+    resharder.run()
+
+    assert resharder.stats == {"moved": 3, "unchanged": 1, "conflicts": 1, "failed": 0}
+    for name in ("a.jpg", "b.png", "kept.jpg"):
+        assert launcher.layout_path(tmp_path, name, "hash").exists()
+    # .part files stay, and so does one of two files that would end up at the same path
+    assert (tmp_path / "c.jpg.part").exists()
+    assert (tmp_path / "x" / "same.jpg").exists() or (tmp_path / "y" / "same.jpg").exists()
+    assert not (tmp_path / "sub").exists()
+    assert events_of(resharder)[-1] == ("done", False, resharder.stats)
+
+
+def test_plan_skips_directories(tmp_path):
+    make_files(tmp_path, ["a.jpg", "temp/b.jpg.part", "temp/c.jpg"])
+    resharder = launcher.Resharder(tmp_path, "flat", skip=[tmp_path / "temp"])
+    resharder.run()
+    assert files_under(tmp_path) == ["a.jpg", "temp/b.jpg.part", "temp/c.jpg"]
+    assert resharder.stats["unchanged"] == 1
+
+
+def test_flat_layout_round_trip(tmp_path):
+    names = [f"file{n}.jpg" for n in range(50)]
+    make_files(tmp_path, names)
+    launcher.Resharder(tmp_path, "hash").run()
+    assert all(launcher.layout_path(tmp_path, name, "hash").exists() for name in names)
+    launcher.Resharder(tmp_path, "flat").run()
+    assert files_under(tmp_path) == sorted(names)
+
+
+def test_reshard_rejects_unknown_layout(tmp_path):
+    try:
+        launcher.Resharder(tmp_path, "site")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("site layout accepted")
+
+
+def test_cancel_before_start(tmp_path):
+    make_files(tmp_path, ["a.jpg", "b.jpg"])
+    resharder = launcher.Resharder(tmp_path, "hash")
+    resharder.cancel()
+    resharder.run()
+    assert files_under(tmp_path) == ["a.jpg", "b.jpg"]
+    assert events_of(resharder)[-1][:2] == ("done", True)
+
+
+def test_cancel_while_moving_returns(tmp_path, monkeypatch):
+    names = [f"file{n}.jpg" for n in range(200)]
+    make_files(tmp_path, names)
+    moving = threading.Event()
+    real_move = launcher.shutil.move
+
+    def slow_move(source, target):
+        moving.set()
+        threading.Event().wait(0.01)
+        return real_move(source, target)
+
+    monkeypatch.setattr(launcher.shutil, "move", slow_move)
+    resharder = launcher.Resharder(tmp_path, "hash", jobs=2)
+    resharder.start()
+    assert moving.wait(5)
+    resharder.cancel()
+    resharder.join(5)
+    assert not resharder.is_alive()
+
+    done = events_of(resharder)[-1]
+    assert done[:2] == ("done", True)
+    moved = done[2]["moved"]
+    assert 0 < moved < len(names)
+    # Every file is either still in place or at its new path, and the counts agree
+    remaining = [name for name in names if (tmp_path / name).exists()]
+    assert len(remaining) == len(names) - moved
+    assert all(launcher.layout_path(tmp_path, name, "hash").exists() for name in set(names) - set(remaining))
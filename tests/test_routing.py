@@ -0,0 +1,59 @@
+import math
+
+import gallery_dl_launcher_new as launcher
+
+
+def test_same_site_same_instance():
+    router = launcher.SiteRouter()
+    loads = [0, 0, 0, 0]
+    first = router.route("https://alpha-site.org/gallery/1", loads)
+    for n in range(2, 20):
+        assert router.route(f"https://alpha-site.org/gallery/{n}", loads) == first
+    # Subdomains belong to the same site
+    assert router.route("https://img.alpha-site.org/file.jpg", loads) == first
+
+
+def test_placement_survives_a_new_router():
+    urls = [f"https://site{i}-example.org/a" for i in range(50)]
+    loads = [0, 0, 0]
+    placed = [launcher.SiteRouter().route(url, loads) for url in urls]
+    assert placed == [launcher.SiteRouter().route(url, loads) for url in urls]
+
+
+def test_sites_spread_over_instances():
+    router = launcher.SiteRouter()
+    loads = [0, 0, 0, 0]
+    for i in range(400):
+        loads[router.route(f"https://site{i}-example.org/a", loads)] += 1
+    assert all(loads)
+    assert max(loads) <= math.ceil(sum(loads) / len(loads) * (1 + router.overflow))
+
+
+def test_overloaded_instance_overflows():
+    router = launcher.SiteRouter(overflow=0.25)
+    url = "https://busy-site.net/gallery/1"
+    home = router.route(url, [0, 0, 0, 0])
+    loads = [10, 10, 10, 10]
+    loads[home] = 100
+    other = router.route(url, loads)
+    assert other != home
+    # A hot site keeps spilling onto the same next instance on the ring
+    assert router.route("https://busy-site.net/gallery/2", loads) == other
+
+
+def test_hot_site_fills_up_to_cap():
+    router = launcher.SiteRouter(overflow=0.5)
+    loads = [0, 0, 0]
+    for n in range(300):
+        loads[router.route(f"https://hot-site.com/{n}", loads)] += 1
+    # Without overflow every URL would land on one instance
+    assert sorted(loads)[-2] > 0
+    assert max(loads) <= math.ceil(sum(loads) / len(loads) * 1.5)
+
+
+def test_instance_count_change_rebuilds_ring():
+    router = launcher.SiteRouter()
+    urls = [f"https://site{i}-example.org/a" for i in range(100)]
+    assert {router.route(url, [0, 0]) for url in urls} == {0, 1}
+    assert {router.route(url, [0, 0, 0, 0, 0]) for url in urls} == set(range(5))
+    assert router.route(urls[0], [7]) == 0
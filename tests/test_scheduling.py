@@ -0,0 +1,106 @@
+import time
+from datetime import datetime
+
+import pytest
+
+import gallery_dl_launcher_new as launcher
+
+
+def next_run(expr: str, after: datetime) -> datetime:
+    return datetime.fromtimestamp(launcher.CronSchedule(expr).next_after(after.timestamp()))
+
+
+def test_cron_steps_and_ranges():
+    assert next_run("*/15 * * * *", datetime(2024, 5, 1, 10, 7)) == datetime(2024, 5, 1, 10, 15)
+    assert next_run("*/15 * * * *", datetime(2024, 5, 1, 10, 45)) == datetime(2024, 5, 1, 11, 0)
+    assert next_run("30 8-10 * * *", datetime(2024, 5, 1, 10, 30)) == datetime(2024, 5, 2, 8, 30)
+
+
+def test_cron_names_and_macros():
+    # 2024-05-03 is a Friday
+    assert next_run("0 9 * * mon-fri", datetime(2024, 5, 3, 9, 0)) == datetime(2024, 5, 6, 9, 0)
+    assert next_run("0 0 1 jun *", datetime(2024, 5, 3)) == datetime(2024, 6, 1)
+    assert next_run("@daily", datetime(2024, 12, 31, 23, 59)) == datetime(2025, 1, 1)
+    assert next_run("0 0 * * 7", datetime(2024, 5, 3)) == datetime(2024, 5, 5)
+
+
+def test_cron_either_day_field_matches():
+    # The 13th or any Friday, as in cron
+    assert next_run("0 0 13 * fri", datetime(2024, 5, 1)) == datetime(2024, 5, 3)
+    assert next_run("0 0 13 * fri", datetime(2024, 5, 10, 1)) == datetime(2024, 5, 13)
+
+
+@pytest.mark.parametrize("expr", ["0 0 * *", "60 * * * *", "*/0 * * * *", "0 0 * foo *"])
+def test_cron_rejects_invalid(expr):
+    with pytest.raises(ValueError):
+        launcher.CronSchedule(expr)
+
+
+def test_cron_never_matching():
+    with pytest.raises(ValueError):
+        launcher.CronSchedule("0 0 30 2 *").next_after(datetime(2024, 1, 1).timestamp())
+
+
+@pytest.fixture
+def schedules(tmp_path):
+    store = launcher.ScheduleStore(tmp_path / "schedules.db")
+    yield store
+    store.close()
+
+
+def run_scheduler(store, **caps):
+    queued = []
+
+    def enqueue(entry):
+        queued.append(entry["url"])
+        return True
+
+    return launcher.Scheduler(store, enqueue, **caps), queued
+
+
+def test_tick_site_cap_defers_to_next_window(schedules):
+    alpha = [f"https://alpha-site.org/gallery/{i}" for i in range(5)]
+    beta = ["https://beta-site.net/gallery/1"]
+    schedules.add(alpha + beta, "6h", jitter=0)
+    scheduler, queued = run_scheduler(schedules, max_per_window=10, max_per_site=2)
+    now = time.time() + 1
+
+    assert scheduler.tick(now) == {"queued": 3, "still_queued": 0, "deferred": 3}
+    assert sum(url in alpha for url in queued) == 2
+    assert beta[0] in queued
+    # The capped entries wait for the next window instead of staying due
+    assert schedules.due(now) == []
+    waiting = [entry for entry in schedules.entries() if entry["url"] not in queued]
+    assert {entry["next_run"] for entry in waiting} == {now + launcher.SCHEDULE_WINDOW}
+
+    result = scheduler.tick(now + launcher.SCHEDULE_WINDOW)
+    assert result == {"queued": 2, "still_queued": 0, "deferred": 1}
+    assert len(set(queued)) == len(queued) == 5
+    assert sum(url in alpha for url in queued) == 4
+
+
+def test_tick_total_cap_keeps_entries_due(schedules):
+    urls = [f"https://site{i}-example.org/a" for i in range(4)]
+    schedules.add(urls, "6h", jitter=0)
+    scheduler, queued = run_scheduler(schedules, max_per_window=2, max_per_site=5)
+    now = time.time() + 1
+
+    assert scheduler.tick(now) == {"queued": 2, "still_queued": 0, "deferred": 2}
+    assert sorted(entry["url"] for entry in schedules.due(now)) == sorted(set(urls) - set(queued))
+    # Still the same window: nothing more goes out
+    assert scheduler.tick(now + 1)["queued"] == 0
+    assert scheduler.tick(now + launcher.SCHEDULE_WINDOW)["queued"] == 2
+    assert sorted(queued) == sorted(urls)
+
+
+def test_tick_counts_still_queued_runs(schedules):
+    schedules.add(["https://gamma-site.com/x"], "6h", jitter=0)
+    scheduler = launcher.Scheduler(schedules, lambda entry: False)
+    now = time.time() + 1
+
+    assert scheduler.tick(now) == {"queued": 0, "still_queued": 1, "deferred": 0}
+    # The run is recorded, so the entry is not due again until its next interval
+    assert schedules.due(now) == []
+    entry, = schedules.entries()
+    assert entry["runs"] == 1
+    assert entry["next_run"] > now + 5 * 3600